@@ -35,6 +35,7 @@ class Settings(BaseSettings):
     # Session Configuration
     session_folder: str = Field(default="sessions", description="Folder for storing Telegram sessions")
     session_timeout: int = Field(default=3600, description="Session timeout in seconds")
+    telegram_rpc_concurrency: int = Field(default=8, description="Maximum concurrent auth/status RPCs sent to Telegram")
 
     # CORS Configuration
     # Store as string to avoid JSON parsing issues, converted to list via properties
@@ -72,6 +73,8 @@ class Settings(BaseSettings):
     )
     database_pool_size: int = Field(default=20, description="Database connection pool size")
     database_max_overflow: int = Field(default=10, description="Database max overflow connections")
+    database_pool_recycle: int = Field(default=1800, description="Recycle pooled connections after this many seconds")
+    database_use_null_pool: bool = Field(default=False, description="Disable connection pooling (open a new connection per checkout)")
 
     # Logging Configuration
     log_level: str = Field(default="INFO", description="Logging level")
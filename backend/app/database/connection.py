@@ -15,8 +15,11 @@ from sqlalchemy import event
 from sqlalchemy.engine import Engine
 
 # Create async engine
-# NullPool is used in production for better connection management with asyncpg
-# When using NullPool, pool_size and max_overflow parameters should NOT be passed
+# A shared pool is used in every environment so bursts of concurrent requests
+# (e.g. session status polling) reuse connections instead of opening new ones.
+# pool_pre_ping drops dead connections and pool_recycle retires them before the
+# server-side idle timeout. Set DATABASE_USE_NULL_POOL=true to fall back to NullPool
+# (a fresh connection per checkout; pool_size/max_overflow must NOT be passed then).
 # SSL is disabled for Fly.io internal network (.flycast) - asyncpg requires False (boolean) or "disable"
 
 # Determine connect_args based on database type
@@ -43,24 +46,22 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
     except Exception as e:
         logger.warning(f"Failed to set SQLite PRAGMAs: {e}")
 
-if settings.is_production:
-    engine = create_async_engine(
-        settings.database_url,
-        echo=settings.debug,  # Log SQL queries in debug mode
-        pool_pre_ping=True,  # Verify connections before using them
-        poolclass=NullPool,  # NullPool for production (no pool_size/max_overflow)
-        connect_args=connect_args,
-    )
+if settings.database_use_null_pool:
+    pool_kwargs = {"poolclass": NullPool}
 else:
-    # In development, use default pool with size limits
-    engine = create_async_engine(
-        settings.database_url,
-        echo=False,  # Log SQL queries in debug mode
-        pool_size=settings.database_pool_size,
-        max_overflow=settings.database_max_overflow,
-        pool_pre_ping=True,  # Verify connections before using them
-        connect_args=connect_args,
-    )
+    pool_kwargs = {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_recycle": settings.database_pool_recycle,
+    }
+
+engine = create_async_engine(
+    settings.database_url,
+    echo=settings.debug and settings.is_production,  # Log SQL queries in production debug mode
+    pool_pre_ping=True,  # Verify connections before using them
+    connect_args=connect_args,
+    **pool_kwargs,
+)
 
 # Create session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -72,6 +72,20 @@ class JobRepository:
         )
         return list(result.scalars().all())
 
+    async def get_active_jobs_by_users(self, user_ids: List[int]) -> List[CopyJob]:
+        """Get active jobs (running or pending) for several users in one query."""
+        if not user_ids:
+            return []
+        result = await self.db.execute(
+            select(CopyJob)
+            .options(joinedload(CopyJob.user))
+            .where(
+                CopyJob.user_id.in_(user_ids),
+                CopyJob.status.in_(["pending", "running"]),
+            )
+        )
+        return list(result.scalars().all())
+
     async def get_real_time_jobs_by_user(self, user_id: int) -> List[CopyJob]:
         """Get active real-time jobs for a user."""
         result = await self.db.execute(
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.models import TelegramSession
@@ -89,3 +89,12 @@ class SessionRepository:
         """Delete session."""
         await self.db.delete(session)
         await self.db.flush()
+
+    async def delete_by_phones(self, phone_numbers: List[str]) -> int:
+        """Delete sessions for several phone numbers in one statement."""
+        if not phone_numbers:
+            return 0
+        result = await self.db.execute(
+            delete(TelegramSession).where(TelegramSession.phone_number.in_(phone_numbers))
+        )
+        return result.rowcount
@@ -1,7 +1,7 @@
 """User repository for database operations."""
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -53,6 +53,13 @@ class UserRepository:
         result = await self.db.execute(select(User).where(User.phone_number == phone_number))
         return result.scalar_one_or_none()
 
+    async def get_by_phones(self, phone_numbers: List[str]) -> Dict[str, User]:
+        """Get users by phone numbers, keyed by phone number."""
+        if not phone_numbers:
+            return {}
+        result = await self.db.execute(select(User).where(User.phone_number.in_(phone_numbers)))
+        return {user.phone_number: user for user in result.scalars().all()}
+
     async def get_by_firebase_uid(self, firebase_uid: str) -> Optional[User]:
         """Get user by Firebase UID."""
         result = await self.db.execute(select(User).where(User.firebase_uid == firebase_uid))
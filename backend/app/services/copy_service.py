@@ -1,6 +1,7 @@
 """Copy service for handling message copying operations."""
 
 import asyncio
+import io
 import random
 import uuid
 from datetime import datetime
@@ -8,8 +9,10 @@ from typing import Callable, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.core.exceptions import CopyServiceError, SessionError
 from app.core.logger import get_logger
+from app.database.connection import AsyncSessionLocal
 from app.database.repositories.job_repository import JobRepository
 from app.database.repositories.session_repository import SessionRepository
 from app.database.repositories.user_repository import UserRepository
@@ -25,6 +28,7 @@ from telethon.errors import (
     SessionRevokedError,
     UserDeactivatedBanError,
 )
+from telethon import events
 from telethon.tl.types import MessageService
 
 logger = get_logger(__name__)
@@ -160,7 +164,6 @@ class CopyService:
                                 break
                     
                     # Determine file extension based on media type
-                    import io
                     file_obj = io.BytesIO(media_bytes)
                     
                     if original_filename:
@@ -457,7 +460,6 @@ class CopyService:
                 
                 # Fallback to settings
                 if api_id is None or api_hash is None:
-                    from app.config import settings
                     api_id = api_id or settings.api_id
                     api_hash = api_hash or settings.api_hash
                 
@@ -696,7 +698,6 @@ class CopyService:
 
                 # Fallback to settings
                 if api_id is None or api_hash is None:
-                    from app.config import settings
                     api_id = api_id or settings.api_id
                     api_hash = api_hash or settings.api_hash
                 
@@ -745,7 +746,6 @@ class CopyService:
             # Helper function for protected channel copying in real-time mode
             async def _copy_message_protected_inline(message, fresh_job, handler_repo, handler_db):
                 """Copy a message from protected channel using download/upload approach."""
-                import io
                 try:
                     if message.media:
                         # Download media to memory
@@ -847,10 +847,6 @@ class CopyService:
             # Create event handler
             async def message_handler(event):
                 """Handle new messages from source channel."""
-                # Import here to avoid circular imports
-                from app.database.connection import AsyncSessionLocal
-                from app.database.repositories.job_repository import JobRepository
-                
                 logger.debug(f"[Handler {job_id}] Message received: {event.message.id}")
 
                 # Create a new database session for this handler
@@ -988,14 +984,13 @@ class CopyService:
                         logger.warning(f"Failed to forward message {event.message.id}: {e}")
 
             # Register handler
-            from telethon import events
             client.add_event_handler(
                 message_handler,
                 events.NewMessage(chats=source_entity)
             )
 
             # Store handler in TelegramService (Singleton)
-            self._telegram_service.add_real_time_handler(job_id, phone_number, message_handler)
+            self._telegram_service.add_real_time_handler(job_id, phone_number, message_handler, client)
 
             # Update job status to running
             db_job = await self.job_repo.update_status(db_job, "running")
@@ -12,7 +12,7 @@ from app.core.logger import get_logger
 from app.database.repositories.session_repository import SessionRepository
 from app.database.repositories.temp_auth_repository import TempAuthRepository
 from app.models.session import TemporarySession
-from app.services.telegram_service import TelegramService
+from app.services.telegram_service import TelegramService, sanitize_phone
 
 logger = get_logger(__name__)
 
@@ -116,7 +116,7 @@ class SessionService:
         Returns:
             Session key
         """
-        return phone_number.replace("+", "").replace(" ", "").replace("-", "")
+        return sanitize_phone(phone_number)
 
     async def create_temp_session(
         self,
@@ -1,7 +1,17 @@
 """Telegram service for managing Telegram clients and authentication."""
 
 import asyncio
-from datetime import datetime, timedelta
+import errno
+import functools
+import hashlib
+import logging
+import os
+import random
+import re
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
@@ -30,13 +40,77 @@ from app.core.exceptions import (
     TelegramAPIError,
 )
 from app.core.logger import get_logger
+from app.database.repositories.job_repository import JobRepository
 from app.database.repositories.session_repository import SessionRepository
+from app.database.repositories.user_repository import UserRepository
 from app.models.session import SessionStatus, TelegramSession
 
 logger = get_logger(__name__)
 
 # Session expiration: 7 days
 SESSION_EXPIRATION_DAYS = 7
+SESSION_EXPIRATION_SECONDS = SESSION_EXPIRATION_DAYS * 86400
+
+# Characters stripped from phone numbers when building session names
+_PHONE_STRIP = str.maketrans("", "", "+ -")
+
+# Digits-only phone part at the start of a session name ("5511999_abcd1234" -> "5511999")
+_SESSION_NAME_RE = re.compile(r"(\d+)(?:_|$)")
+
+# Grace period after authentication during which the monitor won't clean up a session
+AUTH_GRACE_PERIOD_SECONDS = 300.0
+
+# Seconds during which repeated revocation signals for the same phone are ignored
+REVOCATION_DEDUP_SECONDS = 30.0
+
+# Seconds the session monitor waits for a single get_me() probe
+MONITOR_PROBE_TIMEOUT = 10
+
+# Seconds check_session_status waits for get_me(); it holds an RPC permit that logins share
+STATUS_PROBE_TIMEOUT = 10
+
+# Maximum number of get_me() probes the session monitor runs at the same time
+MONITOR_PROBE_CONCURRENCY = 16
+
+# The monitor wakes this many times per interval; each session is probed about once per
+# interval, with up to MONITOR_PROBE_JITTER * interval of random delay to spread the load
+MONITOR_TICKS_PER_INTERVAL = 4
+MONITOR_PROBE_JITTER = 0.25
+
+# Seconds to wait for a client disconnect before giving up on it
+DISCONNECT_TIMEOUT = 5.0
+
+# Seconds a session's last_used_at is reused by _is_session_expired before re-reading it
+SESSION_EXPIRY_CACHE_TTL_SECONDS = 60.0
+
+# Hot-path DB errors log a traceback at most once per this many seconds per call site
+ERROR_TRACEBACK_INTERVAL_SECONDS = 60.0
+
+# Upper bound for the session name/path memo caches
+_SESSION_CACHE_MAX_SIZE = 4096
+
+# Number of per-session locks above which the monitor prunes idle ones
+_LOCKS_PRUNE_THRESHOLD = 1024
+
+
+def sanitize_phone(phone_number: str) -> str:
+    """Strip '+', spaces and dashes from a phone number (the base of every session name)."""
+    return phone_number.translate(_PHONE_STRIP)
+
+
+@functools.lru_cache(maxsize=_SESSION_CACHE_MAX_SIZE)
+def _compute_session_name(phone_number: str, api_id: Optional[int], api_hash: Optional[str]) -> str:
+    """Build the session name for a phone number and optional API credentials (pure, memoized)."""
+    base_name = sanitize_phone(phone_number)
+
+    # If API credentials provided, include their hash in the session name
+    if api_id is not None and api_hash is not None:
+        # Create a short hash of api_id + api_hash. MD5 is kept (not for security) so names
+        # stay identical to existing legacy .session files on disk.
+        cred_string = f"{api_id}:{api_hash}"
+        cred_hash = hashlib.md5(cred_string.encode(), usedforsecurity=False).hexdigest()[:8]
+        return f"{base_name}_{cred_hash}"
+    return base_name
 
 
 class TelegramService:
@@ -46,24 +120,238 @@ class TelegramService:
         """Initialize Telegram service.
         """
         self._active_clients: dict[str, TelegramClient] = {}
-        self._locks: dict[str, asyncio.Lock] = {} # session_name -> asyncio.Lock
-        self._real_time_handlers: dict[str, dict] = {}  # job_id -> {handler, phone_number}
+        self._clients_by_phone: defaultdict[str, set[str]] = defaultdict(set)  # base_name -> {session_name}
+        self._locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)  # session_name -> asyncio.Lock
+        self._real_time_handlers: dict[str, dict] = {}  # job_id -> {handler, phone_number, client}
         self._session_credentials: dict[str, dict[str, any]] = {}  # phone_number -> {api_id, api_hash}
-        self._session_auth_times: dict[str, datetime] = {}  # session_name -> last auth time
+        self._cred_cache: dict[str, tuple[int, str]] = {}  # phone_number -> (api_id, api_hash) last resolved
+        self._session_to_phone: dict[str, str] = {}  # session_name -> phone number it was created for
+        self._expiry_cache: dict[str, tuple[float, float]] = {}  # phone_number -> (expiry epoch, cached at loop time)
+        self._expiry_loads: dict[str, asyncio.Future] = {}  # phone_number -> in-flight last_used_at query
+        self._traceback_logged_at: dict[str, float] = {}  # call site key -> loop time of last logged traceback
+        self._closed = False  # Set by cleanup(); no new clients are created afterwards
+        self._revoked_recently: dict[str, float] = {}  # sanitized phone -> loop time its revocation was handled
+        self._session_auth_times: dict[str, float] = {}  # session_name -> last auth time (event loop clock)
+        self._session_path_cache: dict[str, Path] = {}  # session_name -> session file path
+        # Bounds in-flight auth/status RPCs so request bursts don't trip FloodWait across sessions
+        self._rpc_semaphore = asyncio.Semaphore(settings.telegram_rpc_concurrency)
         self._monitor_task: Optional[asyncio.Task] = None
+        self._monitor_interval: float = 60.0
+        self._next_check_at: dict[str, float] = {}  # session_name -> loop time of its next monitor probe
+        self._pending_deletions: set[Path] = set()  # Locked session files awaiting deletion
+        self._monitor_wake = asyncio.Event()  # Set to request an immediate monitor scan
+        self._bg_tasks: set[asyncio.Task] = set()  # Background tasks drained on cleanup
         self._session_path = Path(settings.session_folder)
-        self._session_path.mkdir(parents=True, exist_ok=True)
+
+    async def __aenter__(self) -> "TelegramService":
+        """Use the service as an async context manager that cleans up on exit."""
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Disconnect all clients and stop background tasks."""
+        await self.cleanup()
+
+    def _ensure_open(self) -> None:
+        """Fail fast instead of connecting new clients after cleanup() has run."""
+        if self._closed:
+            raise TelegramAPIError("Serviço do Telegram encerrado.", status_code=503)
 
     def _get_session_repo(self, db: AsyncSession) -> SessionRepository:
         """Get SessionRepository with provided database session."""
         return SessionRepository(db)
 
+    def _register_client(self, session_name: str, client: TelegramClient, phone_number: Optional[str] = None) -> None:
+        """Store an active client and index it by the phone part of its session name."""
+        if phone_number:
+            self._session_to_phone[session_name] = phone_number
+            # A fresh client means any earlier revocation of this phone is no longer current
+            self._revoked_recently.pop(sanitize_phone(phone_number), None)
+        if not self._active_clients:
+            # Wake the monitor, which idles without ticking while there are no clients
+            self._monitor_wake.set()
+        self._active_clients[session_name] = client
+        self._clients_by_phone[session_name.partition("_")[0]].add(session_name)
+
+    def _unregister_client(self, session_name: str) -> Optional[TelegramClient]:
+        """Remove an active client (if present) and drop it from the phone index."""
+        client = self._active_clients.pop(session_name, None)
+        base_name = session_name.partition("_")[0]
+        session_names = self._clients_by_phone.get(base_name)
+        if session_names is not None:
+            session_names.discard(session_name)
+            if not session_names:
+                del self._clients_by_phone[base_name]
+        return client
+
+    @staticmethod
+    def _is_lock_error(error: OSError) -> bool:
+        """Return True if an OSError means the file is held open by someone else."""
+        return isinstance(error, PermissionError) or error.errno in (errno.EACCES, errno.EBUSY)
+
+    async def _unlink_or_defer(self, path: Path) -> bool:
+        """
+        Delete a file, or move it aside for later deletion if it is locked.
+
+        On Windows, antivirus scanners or a lingering SQLite handle can hold the file.
+        Instead of waiting for the lock to clear, the file is renamed to a unique
+        ".todelete-<uuid>" name (renaming usually works on a locked file) and the
+        session monitor retries the deletion later. Only the renamed file is ever queued.
+
+        Args:
+            path: File to delete
+
+        Returns:
+            True if the file no longer exists at path, False if it could not be moved aside
+        """
+        try:
+            await asyncio.to_thread(path.unlink, missing_ok=True)
+            return True
+        except OSError as e:
+            if not self._is_lock_error(e):
+                raise
+
+        deferred = path.with_name(f"{path.name}.todelete-{uuid.uuid4().hex}")
+        try:
+            await asyncio.to_thread(os.replace, path, deferred)
+        except OSError as e:
+            if not self._is_lock_error(e):
+                raise
+            # Don't queue the original path: a later login may re-create a live session file there
+            logger.warning("Session file locked and could not be moved aside, leaving it in place: %s", path)
+            return False
+
+        logger.info("Session file locked, moved aside for deferred deletion: %s", deferred)
+        self._pending_deletions.add(deferred)
+        self._wake_idle_monitor()
+        return True
+
+    def _wake_idle_monitor(self) -> None:
+        """Wake the monitor if it is idling so that it resumes its periodic ticks."""
+        if not self._active_clients:
+            self._monitor_wake.set()
+
+    async def _sweep_pending_deletions(self) -> None:
+        """Retry deleting files that were locked at logout time."""
+        for path in list(self._pending_deletions):
+            try:
+                await asyncio.to_thread(path.unlink, missing_ok=True)
+            except OSError as e:
+                if not self._is_lock_error(e):
+                    logger.warning("Giving up on deferred deletion of %s: %s", path, e)
+                    self._pending_deletions.discard(path)
+                continue
+            logger.debug("Deleted deferred session file %s", path)
+            self._pending_deletions.discard(path)
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """Start a background task that is tracked until done and cancelled on cleanup."""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+        return task
+
+    async def _safe_disconnect(self, client: TelegramClient, session_name: str) -> None:
+        """
+        Disconnect a client without letting a dead connection stall the caller.
+
+        Args:
+            client: Telegram client to disconnect
+            session_name: Session identifier used in log messages
+        """
+        try:
+            # disconnect() is a no-op for clients that are already disconnected
+            await asyncio.wait_for(client.disconnect(), timeout=DISCONNECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Disconnect timed out for session %s", session_name)
+        except Exception as e:
+            logger.warning("Error disconnecting client %s: %s", session_name, e)
+
+    def _record_auth_time(self, session_name: str) -> None:
+        """Record auth time (monotonic event loop clock) for grace period protection."""
+        self._session_auth_times[session_name] = asyncio.get_running_loop().time()
+
     def _get_lock(self, session_name: str) -> asyncio.Lock:
         """Get or create an asyncio.Lock for a specific session."""
-        if session_name not in self._locks:
-            self._locks[session_name] = asyncio.Lock()
         return self._locks[session_name]
 
+    def _log_error_sampled(self, key: str, message: str) -> None:
+        """
+        Log an error from inside an except block, with a traceback at most once per interval.
+
+        During a database outage every request hits the same error; formatting the
+        full traceback each time only adds load. Repeats are still logged, just
+        without the stack.
+
+        Args:
+            key: Identifies the call site the interval applies to
+            message: Error message
+        """
+        now = asyncio.get_running_loop().time()
+        last = self._traceback_logged_at.get(key)
+        with_traceback = last is None or now - last >= ERROR_TRACEBACK_INTERVAL_SECONDS
+        if with_traceback:
+            self._traceback_logged_at[key] = now
+        logger.error(message, exc_info=with_traceback)
+
+    def _cleanup_locks(self) -> None:
+        """Drop idle session locks once the lock dict grows past _LOCKS_PRUNE_THRESHOLD."""
+        if len(self._locks) <= _LOCKS_PRUNE_THRESHOLD:
+            return
+        # A lock with pending waiters may be briefly unlocked while ownership is handed over
+        idle = [
+            session_name
+            for session_name, lock in self._locks.items()
+            if not lock.locked() and not getattr(lock, "_waiters", None)
+        ]
+        for session_name in idle:
+            del self._locks[session_name]
+        logger.debug("Pruned %s idle session locks", len(idle))
+
+    def _prune_session_state(self) -> None:
+        """
+        Drop per-session bookkeeping that outlived its client.
+
+        disconnect_client and client replacement only unregister the client, so
+        credentials, phone mappings and auth times would otherwise accumulate for
+        every session ever seen. Credentials dropped here are reloaded from the
+        database row on the next use.
+        """
+        now = asyncio.get_running_loop().time()
+        expired_auth = [
+            session_name
+            for session_name, auth_time in self._session_auth_times.items()
+            if now - auth_time >= AUTH_GRACE_PERIOD_SECONDS
+        ]
+        for session_name in expired_auth:
+            del self._session_auth_times[session_name]
+
+        for mapping in (self._session_credentials, self._session_to_phone):
+            stale = [
+                session_name
+                for session_name in mapping
+                if session_name not in self._active_clients and session_name not in self._session_auth_times
+            ]
+            for session_name in stale:
+                del mapping[session_name]
+
+    def _cache_session_expiry(self, phone_number: str, last_used_at: datetime) -> float:
+        """
+        Remember when a session expires so _is_session_expired can skip the DB.
+
+        Args:
+            phone_number: Phone number
+            last_used_at: Naive UTC last activity time from the database
+
+        Returns:
+            Epoch time (seconds) after which the session counts as expired
+        """
+        if len(self._expiry_cache) >= _SESSION_CACHE_MAX_SIZE:
+            self._expiry_cache.clear()
+        # last_used_at is naive UTC; tag it so timestamp() doesn't read it as local time
+        expires_at = last_used_at.replace(tzinfo=timezone.utc).timestamp() + SESSION_EXPIRATION_SECONDS
+        self._expiry_cache[phone_number] = (expires_at, asyncio.get_running_loop().time())
+        return expires_at
+
     async def _is_session_expired(self, phone_number: str, db: AsyncSession) -> bool:
         """
         Check if session is expired (>7 days of inactivity).
@@ -75,63 +363,69 @@ class TelegramService:
         Returns:
             True if session is expired or doesn't exist, False otherwise
         """
-        session_repo = self._get_session_repo(db)
+        now = asyncio.get_running_loop().time()
+        cached = self._expiry_cache.get(phone_number)
+        if cached is not None and now - cached[1] < SESSION_EXPIRY_CACHE_TTL_SECONDS:
+            return time.time() > cached[0]
+
         try:
-            db_session = await session_repo.get_by_phone(phone_number)
-            if not db_session:
+            last_used_at = await self._load_last_used_at(phone_number, db)
+            if last_used_at is None:
+                # Not cached: a login may create the row at any moment
+                self._expiry_cache.pop(phone_number, None)
                 return True  # No session in database
 
             # Check if session is older than 7 days
-            expiration_time = db_session.last_used_at + timedelta(days=SESSION_EXPIRATION_DAYS)
-            is_expired = datetime.utcnow() > expiration_time
+            is_expired = time.time() > self._cache_session_expiry(phone_number, last_used_at)
 
             if is_expired:
-                logger.info(f"Session expired for {phone_number}, last used: {db_session.last_used_at}")
+                logger.info(f"Session expired for {phone_number}, last used: {last_used_at}")
 
             return is_expired
         except Exception as e:
-            logger.error(f"Error checking session expiration: {e}", exc_info=True)
+            self._log_error_sampled("session_expiry", f"Error checking session expiration: {e}")
             return False  # Don't block on errors
 
-    async def _update_session_activity(self, phone_number: str, api_id: int, api_hash: str, db: AsyncSession, user_id: Optional[int] = None):
+    async def _load_last_used_at(self, phone_number: str, db: AsyncSession) -> Optional[datetime]:
         """
-        Update session activity timestamp in database.
+        Load a session's last_used_at, sharing one query among concurrent callers.
+
+        Only the timestamp is shared, never the ORM row, since each caller has its
+        own database session.
 
         Args:
             phone_number: Phone number
-            api_id: API ID
-            api_hash: API Hash
-            db: Database session
-            user_id: User ID (optional, will be looked up if not provided)
+            db: Database session used if this call runs the query
+
+        Returns:
+            last_used_at of the session row, or None if there is no row
         """
-        session_repo = self._get_session_repo(db)
+        pending = self._expiry_loads.get(phone_number)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The caller running the query was cancelled; run it ourselves
 
+        future = asyncio.get_running_loop().create_future()
+        self._expiry_loads[phone_number] = future
         try:
-            db_session = await session_repo.get_by_phone(phone_number)
-
-            if db_session:
-                # Update existing session
-                await session_repo.update_last_used(db_session)
-                logger.debug(f"Updated session activity for {phone_number}")
-            elif user_id:
-                # Create new session record
-                session_name = self._get_session_name(phone_number, api_id, api_hash)
-                session_path = self._get_session_path(session_name)
-                await session_repo.create(
-                    user_id=user_id,
-                    phone_number=phone_number,
-                    session_file_path=str(session_path),
-                    api_id=str(api_id),
-                    api_hash=api_hash
-                )
-                logger.info(f"Created session record in database for {phone_number}")
+            db_session = await self._get_session_repo(db).get_by_phone(phone_number)
+            last_used_at = db_session.last_used_at if db_session else None
+            future.set_result(last_used_at)
+            return last_used_at
         except Exception as e:
-            logger.error(f"Error updating session activity: {e}", exc_info=True)
-            # Try to rollback to prevent request poisoning
-            try:
-                await db.rollback()
-            except:
-                pass
+            future.set_exception(e)
+            future.exception()  # Retrieved here so an unawaited future doesn't log it again
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            if self._expiry_loads.get(phone_number) is future:
+                del self._expiry_loads[phone_number]
 
     def _get_session_name(self, phone_number: str, api_id: Optional[int] = None, api_hash: Optional[str] = None) -> str:
         """
@@ -149,17 +443,7 @@ class TelegramService:
         Returns:
             Sanitized session name, optionally with API credentials hash
         """
-        base_name = phone_number.replace("+", "").replace(" ", "").replace("-", "")
-
-        # If API credentials provided, include their hash in the session name
-        if api_id is not None and api_hash is not None:
-            import hashlib
-            # Create a short hash of api_id + api_hash
-            cred_string = f"{api_id}:{api_hash}"
-            cred_hash = hashlib.md5(cred_string.encode()).hexdigest()[:8]
-            return f"{base_name}_{cred_hash}"
-
-        return base_name
+        return _compute_session_name(phone_number, api_id, api_hash)
 
     def _get_session_path(self, session_name: str) -> Path:
         """
@@ -171,7 +455,13 @@ class TelegramService:
         Returns:
             Path to session file
         """
-        return self._session_path / f"{session_name}.session"
+        session_path = self._session_path_cache.get(session_name)
+        if session_path is None:
+            session_path = self._session_path / f"{session_name}.session"
+            if len(self._session_path_cache) >= _SESSION_CACHE_MAX_SIZE:
+                self._session_path_cache.clear()
+            self._session_path_cache[session_name] = session_path
+        return session_path
 
     async def create_client(
         self,
@@ -197,12 +487,13 @@ class TelegramService:
         if session_string:
             # Load existing session from database string
             session = StringSession(session_string)
-            logger.info(f"[CREATE_CLIENT] Using StringSession from DB (len={len(session_string)})")
+            logger.info("[CREATE_CLIENT] Using StringSession from DB (len=%d)", len(session_string))
         elif session_name:
-            # File-based session (legacy)
+            # File-based session (legacy); settings already created the session folder
             session_path = self._get_session_path(session_name)
-            session = str(session_path.with_suffix(''))
-            logger.info(f"[CREATE_CLIENT] Session input: {session}, Final Path: {session_path}")
+            # Telethon appends ".session" itself, so pass the path without the suffix
+            session = str(self._session_path / session_name)
+            logger.info("[CREATE_CLIENT] Session input: %s, Final Path: %s", session, session_path)
         elif phone_number:
             # Create a new empty StringSession for new auth flow
             session = StringSession()
@@ -211,7 +502,7 @@ class TelegramService:
             raise ValueError("Either phone_number, session_name, or session_string must be provided")
 
         client = TelegramClient(session, api_id, api_hash)
-        logger.debug(f"[CREATE_CLIENT] Created client")
+        logger.debug("[CREATE_CLIENT] Created client")
         return client
 
     async def get_or_create_client(
@@ -234,9 +525,22 @@ class TelegramService:
 
         Returns:
             TelegramClient instance
+
+        Raises:
+            TelegramAPIError: If the service has already been cleaned up
         """
+        self._ensure_open()
         # Use phone number as key for active clients (unique per user)
         session_key = self._get_session_name(phone_number, api_id, api_hash)
+
+        # Fast path: a connected, unexpired cached client needs neither the lock nor the DB lookup
+        client = self._active_clients.get(session_key)
+        if client is not None and client.is_connected():
+            is_expired = await self._is_session_expired(phone_number, db)
+            # Re-check after the await in case the client was removed meanwhile
+            if not is_expired and self._active_clients.get(session_key) is client:
+                return client
+
         db_session_string = None
         
         if not session_string:
@@ -244,9 +548,12 @@ class TelegramService:
             session_repo = self._get_session_repo(db)
             try:
                 db_session = await session_repo.get_by_phone(phone_number)
+                if db_session:
+                    # Lets _is_session_expired below reuse this row instead of querying again
+                    self._cache_session_expiry(phone_number, db_session.last_used_at)
                 if db_session and db_session.session_string:
                     db_session_string = db_session.session_string
-                    logger.info(f"[GET_OR_CREATE_CLIENT] Found session_string in DB for {phone_number} (len={len(db_session_string)})")
+                    logger.info("[GET_OR_CREATE_CLIENT] Found session_string in DB for %s (len=%d)", phone_number, len(db_session_string))
                 elif db_session:
                     logger.info(f"[GET_OR_CREATE_CLIENT] DB session found for {phone_number} but no session_string (legacy file-based)")
             except Exception as e:
@@ -256,7 +563,7 @@ class TelegramService:
             logger.info(f"[GET_OR_CREATE_CLIENT] Using provided session_string for {phone_number}")
         
         async with self._get_lock(session_key):
-            logger.debug(f"[GET_OR_CREATE_CLIENT] Session key: {session_key} (Lock acquired)")
+            logger.debug("[GET_OR_CREATE_CLIENT] Session key: %s (Lock acquired)", session_key)
 
             # Check if session is expired (>7 days)
             is_expired = await self._is_session_expired(phone_number, db)
@@ -264,18 +571,15 @@ class TelegramService:
             if is_expired:
                 logger.info(f"[GET_OR_CREATE_CLIENT] Session expired for {phone_number}, clearing cached client")
                 if session_key in self._active_clients:
-                    client = self._active_clients.pop(session_key)
-                    try:
-                        if client.is_connected():
-                            await client.disconnect()
-                    except Exception as e:
-                        logger.warning(f"Error disconnecting expired client: {e}")
+                    client = self._unregister_client(session_key)
+                    await self._safe_disconnect(client, session_key)
 
             # Check if client is already active
             if session_key in self._active_clients and not is_expired:
                 client = self._active_clients[session_key]
-                logger.debug(f"[GET_OR_CREATE_CLIENT] Found active client object, connected: {client.is_connected()}")
-                if client.is_connected():
+                connected = client.is_connected()
+                logger.debug("[GET_OR_CREATE_CLIENT] Found active client object, connected: %s", connected)
+                if connected:
                     return client
                 
                 # If disconnected, try to reconnect the existing client object
@@ -287,15 +591,16 @@ class TelegramService:
                     # Session was used from multiple IPs - it's permanently invalidated
                     # Remove from active clients and raise the error - don't try to create a new client
                     logger.error(f"[GET_OR_CREATE_CLIENT] Session {session_key} invalidated (AuthKeyDuplicatedError)")
-                    if session_key in self._active_clients:
-                        self._active_clients.pop(session_key, None)
+                    self._unregister_client(session_key)
                     raise  # Re-raise to be handled at a higher level
                 except Exception as e:
                     logger.warning(f"[GET_OR_CREATE_CLIENT] Failed to reconnect: {e}, creating new one")
                     # Remove the broken client from active_clients before creating a new one
-                    self._active_clients.pop(session_key, None)
+                    self._unregister_client(session_key)
 
-            logger.info(f"[GET_OR_CREATE_CLIENT] Session {session_key} NOT found in active_clients. Available: {list(self._active_clients.keys())}")
+            logger.info("[GET_OR_CREATE_CLIENT] Session %s NOT found in active_clients. Count: %d", session_key, len(self._active_clients))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[GET_OR_CREATE_CLIENT] Available sessions: %s", list(self._active_clients))
 
             # Create new client - prefer session_string first
             if db_session_string:
@@ -311,10 +616,17 @@ class TelegramService:
                 logger.error(f"[GET_OR_CREATE_CLIENT] Session {session_key} invalidated during connect (AuthKeyDuplicatedError)")
                 raise  # Re-raise to be handled at a higher level
             
-            logger.debug(f"[GET_OR_CREATE_CLIENT] Client connected: {client.is_connected()}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[GET_OR_CREATE_CLIENT] Client connected: %s", client.is_connected())
+
+            if self._closed:
+                # cleanup() ran while we were connecting; don't leave a client it can't see
+                await self._safe_disconnect(client, session_key)
+                self._ensure_open()
 
-            # Store active client
-            self._active_clients[session_key] = client
+            # Store active client along with the credentials it was built from
+            self._register_client(session_key, client, phone_number)
+            self._cache_credentials(phone_number, api_id, api_hash)
 
             return client
 
@@ -342,6 +654,7 @@ class TelegramService:
             RateLimitError: If rate limited
             ValidationError: If phone number is invalid
         """
+        self._ensure_open()
         try:
             # Generate session key for caching
             session_key = self._get_session_name(phone_number, api_id, api_hash)
@@ -349,32 +662,29 @@ class TelegramService:
             # Disconnect any existing active clients for this phone
             if session_key in self._active_clients:
                 logger.info(f"Discarding existing active client for {phone_number}")
-                old_client = self._active_clients.pop(session_key)
-                try:
-                    if old_client.is_connected():
-                        await old_client.disconnect()
-                except Exception as e:
-                    logger.warning(f"Error disconnecting old client: {e}")
+                old_client = self._unregister_client(session_key)
+                await self._safe_disconnect(old_client, session_key)
 
             # Create a NEW StringSession client for authentication
             client = await self.create_client(api_id, api_hash, phone_number=phone_number)
             await client.connect()
 
             # Send verification code
-            result = await client.send_code_request(phone_number)
+            async with self._rpc_semaphore:
+                result = await client.send_code_request(phone_number)
             phone_code_hash = result.phone_code_hash
             
             # Extract session string for DB storage
             session_string = client.session.save()
-            logger.info(f"[SEND_CODE] Session string extracted (len={len(session_string)})")
+            logger.info("[SEND_CODE] Session string extracted (len=%d)", len(session_string))
 
             # Store client in active_clients for reuse in verify_code
-            self._active_clients[session_key] = client
+            self._register_client(session_key, client, phone_number)
             logger.info(f"Registered client for {phone_number} in active_clients")
             
             # Record creation time for grace period protection
             # This prevents the session monitor from cleaning up before user enters code
-            self._session_auth_times[session_key] = datetime.utcnow()
+            self._record_auth_time(session_key)
 
             # Keep client connected for verify_code to reuse
             logger.info(f"Verification code sent to {phone_number}")
@@ -420,14 +730,14 @@ class TelegramService:
         """
         try:
             # Sign in with code
-            user = await client.sign_in(phone_number, phone_code, phone_code_hash=phone_code_hash)
+            async with self._rpc_semaphore:
+                user = await client.sign_in(phone_number, phone_code, phone_code_hash=phone_code_hash)
 
             # CORRECTLY determine session name from the active client's session file
             # This ensures we use the unique name (e.g. phone_TIMESTAMP) instead of the base name
             # preventing key mismatches in _active_clients
             if hasattr(client.session, 'filename'):
-                 import pathlib
-                 session_name = pathlib.Path(client.session.filename).stem
+                 session_name = Path(client.session.filename).stem
             else:
                  # Fallback (e.g. MemorySession)
                  session_name = self._get_session_name(phone_number, client.api_id, client.api_hash)
@@ -435,7 +745,7 @@ class TelegramService:
             logger.info(f"[VERIFY_CODE] Authenticated session: {session_name}")
 
             # Store active client (update/ensure it's in the map under the correct key)
-            self._active_clients[session_name] = client
+            self._register_client(session_name, client, phone_number)
             
             # Force save/flush of the session state
             # Telethon SQLite session usually saves on changes, but we want to be sure
@@ -451,13 +761,13 @@ class TelegramService:
                 "api_id": client.api_id,
                 "api_hash": client.api_hash
             }
+            self._cache_credentials(phone_number, client.api_id, client.api_hash)
             
             # Record auth time for grace period protection
-            self._session_auth_times[session_name] = datetime.utcnow()
+            self._record_auth_time(session_name)
 
-            # Use get_me() to verify - more reliable than is_user_authorized() for StringSession
-            me = await client.get_me()
-            logger.info(f"User {phone_number} authenticated successfully, authorized: {me is not None}")
+            # sign_in() returning a user already means authorized (Telethon records the user id on login)
+            logger.info(f"User {phone_number} authenticated successfully, user id: {user.id}")
 
             return {
                 "user_id": user.id,
@@ -499,19 +809,19 @@ class TelegramService:
             AuthenticationError: If password is invalid
         """
         try:
-            user = await client.sign_in(password=password)
+            async with self._rpc_semaphore:
+                user = await client.sign_in(password=password)
 
             # Now the client is fully authenticated
             if phone_number:
                 # CORRECTLY determine session name from the active client's session file
                 if hasattr(client.session, 'filename'):
-                     import pathlib
-                     session_name = pathlib.Path(client.session.filename).stem
+                     session_name = Path(client.session.filename).stem
                 else:
                      session_name = self._get_session_name(phone_number, client.api_id, client.api_hash)
 
                 # Store active client
-                self._active_clients[session_name] = client
+                self._register_client(session_name, client, phone_number)
                 
                 # Force save/flush of the session state for 2FA as well
                 try:
@@ -526,13 +836,13 @@ class TelegramService:
                     "api_id": client.api_id,
                     "api_hash": client.api_hash
                 }
+                self._cache_credentials(phone_number, client.api_id, client.api_hash)
                 
                 # Record auth time for grace period protection
-                self._session_auth_times[session_name] = datetime.utcnow()
+                self._record_auth_time(session_name)
 
-                # Use get_me() to verify - more reliable than is_user_authorized() for StringSession
-                me = await client.get_me()
-                logger.info(f"2FA authentication successful for {phone_number}, authorized: {me is not None}")
+                # sign_in() returning a user already means authorized (Telethon records the user id on login)
+                logger.info(f"2FA authentication successful for {phone_number}, user id: {user.id}")
 
             return {
                 "user_id": user.id,
@@ -560,128 +870,136 @@ class TelegramService:
         session_name = self._get_session_name(phone_number, api_id, api_hash)
         return self._session_credentials.get(session_name)
     
-    async def check_session_status(
+    def _cache_credentials(self, phone_number: str, api_id: int, api_hash: str) -> None:
+        """Remember the API credentials last used for a phone number."""
+        if len(self._cred_cache) >= _SESSION_CACHE_MAX_SIZE:
+            self._cred_cache.clear()
+        self._cred_cache[phone_number] = (api_id, api_hash)
+
+    def _resolve_credentials(
         self,
         phone_number: str,
-        db: AsyncSession,
         api_id: Optional[int] = None,
-        api_hash: Optional[str] = None
-    ) -> TelegramSession:
+        api_hash: Optional[str] = None,
+        db_session=None
+    ) -> tuple[int, str]:
         """
-        Check if a session exists and is authorized.
+        Fill in missing API credentials for a phone number.
+
+        Missing values come from, in order: the per-phone credential cache, the
+        credentials stored for the session in memory, the database session row
+        (if the caller already loaded it), and finally the app settings.
 
         Args:
             phone_number: Phone number
-            db: Database session
             api_id: Telegram API ID (optional)
             api_hash: Telegram API Hash (optional)
+            db_session: Already loaded database session row (optional)
 
         Returns:
-            TelegramSession with status information
+            Tuple of (api_id, api_hash)
         """
-        # First, ensure we have API credentials before generating session name
-        if api_id is None or api_hash is None:
+        if api_id is not None and api_hash is not None:
+            return api_id, api_hash
+
+        cached = self._cred_cache.get(phone_number)
+        if cached is None:
             stored_creds = self.get_session_credentials(phone_number, api_id, api_hash)
             if stored_creds:
-                api_id = api_id or stored_creds.get("api_id")
-                api_hash = api_hash or stored_creds.get("api_hash")
+                cached = (stored_creds.get("api_id"), stored_creds.get("api_hash"))
+            elif db_session and db_session.api_id and db_session.api_hash:
+                cached = (int(db_session.api_id), db_session.api_hash)
+            if cached is not None:
+                self._cache_credentials(phone_number, *cached)
 
-        # Try to get credentials from database if still not available
-        if api_id is None or api_hash is None:
-            session_repo = self._get_session_repo(db)
-            try:
-                db_session = await session_repo.get_by_phone(phone_number)
-                if db_session and db_session.api_id and db_session.api_hash:
-                    api_id = api_id or int(db_session.api_id)
-                    api_hash = api_hash or db_session.api_hash
-            except Exception as e:
-                logger.error(f"[CHECK_SESSION] Error getting credentials from database: {e}", exc_info=True)
+        if cached is not None:
+            api_id = api_id or cached[0]
+            api_hash = api_hash or cached[1]
 
         # Fallback to settings
         if api_id is None or api_hash is None:
-            from app.config import settings
             api_id = api_id or settings.api_id
             api_hash = api_hash or settings.api_hash
+        return api_id, api_hash
 
-        session_name = self._get_session_name(phone_number, api_id, api_hash)
+    async def check_session_status(
+        self,
+        phone_number: str,
+        db: AsyncSession,
+        api_id: Optional[int] = None,
+        api_hash: Optional[str] = None
+    ) -> TelegramSession:
+        """
+        Check if a session exists and is authorized.
+
+        Args:
+            phone_number: Phone number
+            db: Database session
+            api_id: Telegram API ID (optional)
+            api_hash: Telegram API Hash (optional)
 
-        # Check if we have a session (either in memory or in database)
+        Returns:
+            TelegramSession with status information
+        """
+        # Load the database session once; it serves both the credential fallback and the existence check
         session_repo = self._get_session_repo(db)
         try:
             db_session = await session_repo.get_by_phone(phone_number)
         except Exception as e:
-            logger.error(f"[CHECK_SESSION] Error getting session from database: {e}", exc_info=True)
+            self._log_error_sampled("check_session_db", f"[CHECK_SESSION] Error getting session from database: {e}")
             db_session = None
-        
+        if db_session:
+            self._cache_session_expiry(phone_number, db_session.last_used_at)
+
+        api_id, api_hash = self._resolve_credentials(phone_number, api_id, api_hash, db_session)
+        session_name = self._get_session_name(phone_number, api_id, api_hash)
+        # Results are built with model_construct (no validation), so normalize what validation
+        # would: api_id can be a string from request JSON, and use_enum_values stores status values
+        base = dict(session_name=session_name, phone_number=phone_number, api_id=int(api_id), api_hash=api_hash)
+
+        def disconnected() -> TelegramSession:
+            return TelegramSession.model_construct(
+                **base, status=SessionStatus.DISCONNECTED.value, is_authorized=False
+            )
+
         # If no session in database and no active client, session doesn't exist
         if not db_session and session_name not in self._active_clients:
-            return TelegramSession(
-                session_name=session_name,
-                phone_number=phone_number,
-                api_id=api_id,
-                api_hash=api_hash,
-                status=SessionStatus.DISCONNECTED,
-                is_authorized=False
-            )
+            return disconnected()
 
         try:
-            client = await self.get_or_create_client(phone_number, api_id, api_hash, db)
+            # Hand over the row we already loaded so get_or_create_client doesn't query it again
+            client = await self.get_or_create_client(
+                phone_number, api_id, api_hash, db,
+                session_string=db_session.session_string if db_session else None
+            )
             
             # For StringSession, is_user_authorized() may return False even for valid sessions
             # because _self_id isn't set until get_me() is called.
             # Try get_me() directly - if it succeeds, the session is authorized.
             try:
-                me = await client.get_me()
+                async with self._rpc_semaphore:
+                    me = await asyncio.wait_for(client.get_me(), timeout=STATUS_PROBE_TIMEOUT)
                 if me:
-                    return TelegramSession(
-                        session_name=session_name,
-                        phone_number=phone_number,
-                        api_id=api_id,
-                        api_hash=api_hash,
-                        status=SessionStatus.CONNECTED,
-                        user_id=me.id,
-                        is_authorized=True
+                    # This get_me() already proved the session; the monitor needn't probe it again soon
+                    self._schedule_next_probe(session_name)
+                    return TelegramSession.model_construct(
+                        **base, status=SessionStatus.CONNECTED.value, user_id=me.id, is_authorized=True
                     )
                 else:
-                    return TelegramSession(
-                        session_name=session_name,
-                        phone_number=phone_number,
-                        api_id=api_id,
-                        api_hash=api_hash,
-                        status=SessionStatus.DISCONNECTED,
-                        is_authorized=False
-                    )
+                    return disconnected()
             except AuthKeyUnregisteredError:
                 logger.warning(f"Session {session_name} auth key is unregistered")
-                return TelegramSession(
-                    session_name=session_name,
-                    phone_number=phone_number,
-                    api_id=api_id,
-                    api_hash=api_hash,
-                    status=SessionStatus.DISCONNECTED,
-                    is_authorized=False
-                )
+                return disconnected()
+            except asyncio.TimeoutError:
+                logger.warning(f"Session {session_name} status check timed out after {STATUS_PROBE_TIMEOUT}s")
+                return disconnected()
 
         except AuthKeyDuplicatedError:
             logger.error(f"Session {session_name} invalidated: Auth key duplicated (used in multiple locations). Marking as disconnected.")
-            return TelegramSession(
-                session_name=session_name,
-                phone_number=phone_number,
-                api_id=api_id,
-                api_hash=api_hash,
-                status=SessionStatus.DISCONNECTED,
-                is_authorized=False
-            )
+            return disconnected()
         except Exception as e:
-            logger.error(f"Error checking session status: {e}", exc_info=True)
-            return TelegramSession(
-                session_name=session_name,
-                phone_number=phone_number,
-                api_id=api_id,
-                api_hash=api_hash,
-                status=SessionStatus.DISCONNECTED,
-                is_authorized=False
-            )
+            self._log_error_sampled("check_session", f"Error checking session status: {e}")
+            return disconnected()
 
     async def disconnect_client(self, phone_number: str, api_id: Optional[int] = None, api_hash: Optional[str] = None) -> None:
         """
@@ -692,30 +1010,133 @@ class TelegramService:
             api_id: Optional API ID - if not provided, disconnects all sessions for this phone
             api_hash: Optional API Hash - if not provided, disconnects all sessions for this phone
         """
+        self._expiry_cache.pop(phone_number, None)
         if api_id and api_hash:
             # Disconnect specific session
             session_name = self._get_session_name(phone_number, api_id, api_hash)
             async with self._get_lock(session_name):
                 if session_name in self._active_clients:
-                    client = self._active_clients.pop(session_name)
-                    if client.is_connected():
-                        await client.disconnect()
+                    client = self._unregister_client(session_name)
+                    await self._safe_disconnect(client, session_name)
                     logger.info(f"Disconnected client for {phone_number} with API ID {api_id}")
         else:
             # Disconnect all sessions for this phone number
-            base_name = phone_number.replace("+", "").replace(" ", "").replace("-", "")
-            sessions_to_remove = [name for name in self._active_clients.keys() if name.startswith(base_name)]
+            base_name = sanitize_phone(phone_number)
+            sessions_to_remove = list(self._clients_by_phone.get(base_name, ()))
+            clients = [(name, self._unregister_client(name)) for name in sessions_to_remove]
+            await asyncio.gather(
+                *(self._safe_disconnect(client, name) for name, client in clients)
+            )
             for session_name in sessions_to_remove:
-                client = self._active_clients[session_name]
-                if client.is_connected():
-                    await client.disconnect()
-                del self._active_clients[session_name]
                 logger.info(f"Disconnected client session {session_name}")
 
-    async def logout(self, phone_number: str, db: AsyncSession, api_id: Optional[int] = None, api_hash: Optional[str] = None) -> bool:
+    async def _logout_memory_and_file(self, session_name: str, session_path: Path) -> bool:
+        """
+        Disconnect and unregister the client and delete its session file (no database access).
+
+        Args:
+            session_name: Session identifier
+            session_path: Path to session file
+
+        Returns:
+            bool: True if session file was deleted or didn't exist, False if file remains (locked)
+        """
+        async with self._get_lock(session_name):
+            logger.info("Releasing session %s (Lock acquired)", session_name)
+
+            # Disconnect active client if exists
+            if session_name in self._active_clients:
+                client = self._unregister_client(session_name)
+                await self._safe_disconnect(client, session_name)
+                logger.info("Disconnected Telegram client for session %s", session_name)
+
+        # Delete session file (legacy file-based sessions), deferring it if locked on Windows
+        try:
+            file_deleted = await self._unlink_or_defer(session_path)
+            if file_deleted:
+                logger.info("Session file removed (if present): %s", session_path)
+        except Exception as e:
+            logger.warning("Error deleting session file: %s", e)
+            file_deleted = False
+
+        # SQLite can leave a rollback journal next to the session file; a stale one
+        # makes the next login on this name pick up a half-written session.
+        try:
+            await self._unlink_or_defer(session_path.with_suffix(".session-journal"))
+        except Exception as e:
+            logger.warning("Error deleting session journal: %s", e)
+
+        return file_deleted
+
+    async def _logout_db(self, phone_number: str, db: AsyncSession) -> None:
+        """
+        Delete the database session for a phone number and commit it.
+
+        Runs on the caller's session, so it can't block on a write the caller's own
+        transaction already holds. It commits itself because logout() shields it from
+        cancellation, and a cancelled request closes its session without committing.
+
+        Args:
+            phone_number: Phone number
+            db: Database session
+        """
+        session_repo = self._get_session_repo(db)
+        try:
+            db_session = await session_repo.get_by_phone(phone_number)
+            if db_session:
+                await session_repo.delete(db_session)
+                await db.commit()
+                logger.info(f"Deleted session from database for {phone_number}")
+        except Exception as db_error:
+            logger.error(f"Error deleting session from database: {db_error}", exc_info=True)
+            # The connection may be gone (the usual reason the delete failed); don't fail logout over it
+            try:
+                await db.rollback()
+            except Exception as rollback_error:
+                logger.debug("Rollback failed: %s", rollback_error)
+
+    async def _finalize_logout(
+        self,
+        session_name: str,
+        session_path: Path,
+        phone_number: str,
+        db: AsyncSession
+    ) -> bool:
+        """
+        Disconnect the client, delete the session file and delete the database session.
+
+        logout() runs this under asyncio.shield so that a cancelled request can't stop
+        it between the file deletion and the database deletion.
+
+        Returns:
+            bool: True if session file was deleted or didn't exist, False if file remains (locked)
+        """
+        file_deleted = await self._logout_memory_and_file(session_name, session_path)
+
+        if not file_deleted:
+            # If file deletion fails, we log a warning but PROCEED to delete from DB.
+            # This ensures the user is logged out of the app.
+            # The locked file is queued for deletion by the session monitor.
+            logger.warning(f"Session file locked for {phone_number}, proceeding with DB deletion anyway.")
+
+        await self._logout_db(phone_number, db)
+        return file_deleted
+
+    async def logout(
+        self,
+        phone_number: str,
+        db: AsyncSession,
+        api_id: Optional[int] = None,
+        api_hash: Optional[str] = None
+    ) -> bool:
         """
         Logout user by disconnecting Telegram client and deleting session file.
 
+        The disconnect, file deletion and database deletion are shielded from
+        cancellation: if the caller is cancelled they still run to completion,
+        only the returned flag is lost. The database deletion is committed on db
+        before returning, so it does not depend on the caller committing.
+
         Args:
             phone_number: Phone number
             db: Database session
@@ -729,88 +1150,22 @@ class TelegramService:
             SessionError: If session doesn't exist
         """
         try:
-            # Try to get credentials from stored session if not provided
-            if api_id is None or api_hash is None:
-                stored_creds = self.get_session_credentials(phone_number, api_id, api_hash)
-                if stored_creds:
-                    api_id = api_id or stored_creds.get("api_id")
-                    api_hash = api_hash or stored_creds.get("api_hash")
-
-            # Fallback to settings
-            if api_id is None or api_hash is None:
-                from app.config import settings
-                api_id = api_id or settings.api_id
-                api_hash = api_hash or settings.api_hash
-
+            api_id, api_hash = self._resolve_credentials(phone_number, api_id, api_hash)
             session_name = self._get_session_name(phone_number, api_id, api_hash)
             session_path = self._get_session_path(session_name)
 
-            async with self._get_lock(session_name):
-                logger.info(f"Performing logout for {phone_number} (Lock acquired)")
-                
-                # Disconnect active client if exists
-                if session_name in self._active_clients:
-                    client = self._active_clients.pop(session_name)
-                    try:
-                        if client.is_connected():
-                            await client.disconnect()
-                            logger.info(f"Disconnected Telegram client for {phone_number}")
-                    except Exception as disconnect_error:
-                        logger.warning(f"Error disconnecting client {phone_number} during logout: {disconnect_error}")
-
-            # Remove from session credentials
+            # Remove from session credentials and drop memoized path for this login
             if session_name in self._session_credentials:
                 del self._session_credentials[session_name]
-
-            # Delete session file
-            # Delete session file with retry logic for Windows
-            file_deleted = True
-            if session_path.exists():
-                max_retries = 5
-                retry_delay = 0.5
-                
-                for attempt in range(max_retries):
-                    try:
-                        session_path.unlink()
-                        logger.info(f"Deleted session file: {session_path}")
-                        file_deleted = True
-                        break
-                    except PermissionError:
-                        file_deleted = False
-                        if attempt < max_retries - 1:
-                            logger.warning(f"File locked, retrying deletion in {retry_delay}s: {session_path}")
-                            await asyncio.sleep(retry_delay)
-                            retry_delay *= 2  # Exponential backoff
-                        else:
-                            logger.error(f"Failed to delete session file after {max_retries} attempts: {session_path}")
-                    except Exception as e:
-                        logger.warning(f"Error deleting session file: {e}")
-                        file_deleted = False
-                        break
-            else:
-                logger.warning(f"Session file not found: {session_path}")
-                file_deleted = True
-
-            if not file_deleted:
-                # If file deletion fails, we log a warning but PROCEED to delete from DB.
-                # This ensures the user is logged out of the app.
-                # The locked file will be ignored by future logins (handled by unique session logic).
-                logger.warning(f"Session file locked for {phone_number}, proceeding with DB deletion anyway.")
-                
-            # Deactivate session in database
-            session_repo = self._get_session_repo(db)
-            try:
-                db_session = await session_repo.get_by_phone(phone_number)
-                if db_session:
-                    await session_repo.delete(db_session)
-                    logger.info(f"Deleted session from database for {phone_number}")
-            except Exception as db_error:
-                logger.error(f"Error deleting session from database: {db_error}", exc_info=True)
-                # Rollback to prevent poisoning the rest of the request
-                try:
-                    await db.rollback()
-                except:
-                    pass
+            self._session_to_phone.pop(session_name, None)
+            self._expiry_cache.pop(phone_number, None)
+            self._cred_cache.pop(phone_number, None)
+            self._session_path_cache.pop(session_name, None)
+
+            # Side effects run to completion even if the calling request is cancelled
+            file_deleted = await asyncio.shield(
+                self._finalize_logout(session_name, session_path, phone_number, db)
+            )
 
             logger.info(f"Logout successful for {phone_number}")
             return file_deleted
@@ -822,28 +1177,34 @@ class TelegramService:
             raise SessionError(f"Erro ao fazer logout: {str(e)}")
 
     async def cleanup(self) -> None:
-        """Disconnect all active clients."""
-        for session_name, client in list(self._active_clients.items()):
-            try:
-                if client.is_connected():
-                    await client.disconnect()
-            except Exception as e:
-                logger.error(f"Error disconnecting client {session_name}: {e}")
-            finally:
-                del self._active_clients[session_name]
-
-        # Stop monitor task
-        if self._monitor_task:
-            self._monitor_task.cancel()
-            try:
-                await self._monitor_task
-            except asyncio.CancelledError:
-                pass
-
+        """Disconnect all active clients and stop accepting new ones."""
+        self._closed = True
+        clients = list(self._active_clients.items())
+        self._active_clients.clear()
+        self._clients_by_phone.clear()
+
+        # Disconnect concurrently so shutdown takes ~one round-trip instead of N,
+        # each bounded by DISCONNECT_TIMEOUT.
+        await asyncio.gather(
+            *(self._safe_disconnect(client, name) for name, client in clients)
+        )
+
+        # Stop monitor task and any other background tasks, waiting for them to finish
+        tasks = list(self._bg_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     async def start_session_monitor(self, interval_seconds: int = 60) -> None:
         """
         Start background task to monitor active sessions for validity.
+
+        Each session is probed about every interval_seconds, with per-session
+        jitter so probes are spread over the interval instead of all firing at
+        once. Each tick also retries deferred session file deletions. While there
+        are no active clients and no deferred deletions it waits on _monitor_wake
+        alone and does not tick at all; setting the event only resumes ticking,
+        it never probes sessions ahead of schedule.
         
         Args:
             interval_seconds: How often to check sessions
@@ -853,134 +1214,265 @@ class TelegramService:
             return
             
         logger.info(f"Starting session monitor (interval: {interval_seconds}s)")
+        self._monitor_interval = interval_seconds
+        tick_seconds = interval_seconds / MONITOR_TICKS_PER_INTERVAL
         
         async def monitor_loop():
+            loop = asyncio.get_running_loop()
+            # Ticks follow a fixed monotonic schedule, so time spent checking doesn't stretch the period
+            next_deadline = loop.time() + tick_seconds
             while True:
                 try:
-                    await asyncio.sleep(interval_seconds)
+                    if not self._active_clients and not self._pending_deletions:
+                        await self._monitor_wake.wait()
+                        self._monitor_wake.clear()
+                        next_deadline = loop.time() + tick_seconds
+                        continue
+                    try:
+                        await asyncio.wait_for(
+                            self._monitor_wake.wait(),
+                            timeout=max(0.0, next_deadline - loop.time())
+                        )
+                        # Woken early: run an ordinary tick, which only probes sessions that are due
+                        self._monitor_wake.clear()
+                    except asyncio.TimeoutError:
+                        next_deadline += tick_seconds
                     await self._check_active_sessions()
+                    await self._sweep_pending_deletions()
+                    self._cleanup_locks()
+                    self._prune_session_state()
+
+                    now = loop.time()
+                    if now > next_deadline:
+                        # Skip missed ticks instead of running a backlog of them back to back
+                        logger.debug("Session monitor fell behind schedule by %.1fs", now - next_deadline)
+                        next_deadline = now + tick_seconds
                 except asyncio.CancelledError:
                     logger.info("Session monitor cancelled")
                     break
                 except Exception as e:
                     logger.error(f"Error in session monitor loop: {e}", exc_info=True)
                     await asyncio.sleep(interval_seconds)  # Wait before retrying
+                    next_deadline = loop.time() + tick_seconds
                     
-        self._monitor_task = asyncio.create_task(monitor_loop())
+        self._monitor_task = self._spawn(monitor_loop())
         
+    def _schedule_next_probe(self, session_name: str) -> None:
+        """Schedule a session's next monitor probe one jittered interval from now (never earlier)."""
+        interval = self._monitor_interval
+        next_check = asyncio.get_running_loop().time() + interval + random.uniform(0, interval * MONITOR_PROBE_JITTER)
+        if next_check > self._next_check_at.get(session_name, 0.0):
+            self._next_check_at[session_name] = next_check
+
     async def _check_active_sessions(self) -> None:
-        """Check all active clients to ensure they are still authorized."""
-        # Create a copy of items to avoid modification during iteration
-        active_sessions = list(self._active_clients.items())
-        
+        """Check active clients that are due for a probe to ensure they are still authorized."""
+        if not self._active_clients:
+            self._next_check_at.clear()
+            return
+
+        interval = self._monitor_interval
+        now = asyncio.get_running_loop().time()
+        for session_name in self._next_check_at.keys() - self._active_clients.keys():
+            del self._next_check_at[session_name]
+
+        # Copy due sessions to avoid modification during iteration
+        active_sessions = []
+        for session_name, client in self._active_clients.items():
+            next_check = self._next_check_at.get(session_name)
+            if next_check is None:
+                # First sighting: spread new sessions over the coming interval
+                self._next_check_at[session_name] = now + random.uniform(0, interval)
+                continue
+            if now < next_check:
+                continue
+            if client.is_connected():
+                active_sessions.append((session_name, client))
+
         if not active_sessions:
             return
             
-        logger.debug(f"Monitor checking {len(active_sessions)} active sessions...")
-        
-        for session_name, client in active_sessions:
-            try:
-                if not client.is_connected():
+        logger.debug("Monitor checking %d active sessions...", len(active_sessions))
+
+        # Probe concurrently, bounded so a large tick can't flood Telegram with requests
+        semaphore = asyncio.Semaphore(MONITOR_PROBE_CONCURRENCY)
+        probed = await asyncio.gather(*(
+            self._probe_session(session_name, client, semaphore)
+            for session_name, client in active_sessions
+        ))
+
+        for session_name, _ in active_sessions:
+            self._schedule_next_probe(session_name)
+
+        now = asyncio.get_running_loop().time()
+        revoked: list[str] = []
+        for session_name, me, error in probed:
+            if error is None:
+                if me is not None:
                     continue
-                    
-                # We can check authorization status
-                # If this raises AuthKeyUnregisteredError, the session is dead
-                # For StringSession, is_user_authorized() may return False even for valid sessions
-                # Use get_me() instead which actually verifies with Telegram servers
-                try:
-                    me = await client.get_me()
-                    is_auth = me is not None
-                    if not is_auth:
-                        # Check grace period - skip cleanup for recently authenticated sessions
-                        auth_time = self._session_auth_times.get(session_name)
-                        if auth_time:
-                            grace_period = timedelta(minutes=5)
-                            if datetime.utcnow() - auth_time < grace_period:
-                                logger.debug(f"Session {session_name} appears unauthorized but within grace period - skipping cleanup")
-                                continue
-                        
-                        logger.warning(f"Session {session_name} is no longer authorized. creating cleanup task.")
-                        await self._handle_revoked_session_by_name(session_name)
-
-                except (AuthKeyUnregisteredError, SessionRevokedError, UserDeactivatedBanError):
-                    logger.warning(f"Session {session_name} revoked. Cleaning up.")
-                    await self._handle_revoked_session_by_name(session_name)
-                    
-            except Exception as e:
+                # Check grace period - skip cleanup for recently authenticated sessions
+                auth_time = self._session_auth_times.get(session_name)
+                if auth_time is not None and now - auth_time < AUTH_GRACE_PERIOD_SECONDS:
+                    logger.debug("Session %s appears unauthorized but within grace period - skipping cleanup", session_name)
+                    continue
+
+                logger.warning("Session %s is no longer authorized. creating cleanup task.", session_name)
+                revoked.append(session_name)
+            elif isinstance(error, (AuthKeyUnregisteredError, SessionRevokedError, UserDeactivatedBanError)):
+                logger.warning("Session %s revoked. Cleaning up.", session_name)
+                revoked.append(session_name)
+            else:
                 # Don't let one failure stop the whole loop
-                logger.debug(f"Error checking session {session_name}: {e}")
+                logger.debug("Error checking session %s: %s", session_name, error)
+
+        if revoked:
+            # Each session has its own lock, so teardowns can run concurrently
+            await asyncio.gather(
+                *(self._handle_revoked_session_by_name(session_name) for session_name in revoked)
+            )
+            await self._cleanup_revoked_sessions_in_db(revoked)
+
+    async def _probe_session(
+        self,
+        session_name: str,
+        client: TelegramClient,
+        semaphore: asyncio.Semaphore
+    ) -> tuple[str, Optional[object], Optional[Exception]]:
+        """
+        Verify a session with Telegram for the monitor.
+
+        For StringSession, is_user_authorized() may return False even for valid sessions,
+        so get_me() is used instead since it actually verifies with Telegram servers.
+        If this raises AuthKeyUnregisteredError, the session is dead.
+
+        Args:
+            session_name: Session identifier
+            client: Client to probe
+            semaphore: Limits how many probes run at once
+
+        Returns:
+            Tuple of (session_name, get_me() result, exception raised or None)
+        """
+        try:
+            async with semaphore:
+                me = await asyncio.wait_for(client.get_me(), timeout=MONITOR_PROBE_TIMEOUT)
+            return session_name, me, None
+        except Exception as e:
+            return session_name, None, e
 
     async def _handle_revoked_session_by_name(self, session_name: str) -> None:
-        """Handle cleanup for a specific revoked session name and fail associated jobs."""
+        """Disconnect the client and delete the session file for a revoked session name."""
+        client = self._active_clients.get(session_name)
+        self._session_credentials.pop(session_name, None)
+        if client is not None:
+            # Handlers registered on a revoked client can never fire again; don't keep them around
+            stale_jobs = [
+                job_id for job_id, data in self._real_time_handlers.items()
+                if data.get("client") is client
+            ]
+            for job_id in stale_jobs:
+                del self._real_time_handlers[job_id]
+            if stale_jobs:
+                logger.info("Dropped %d real-time handlers of revoked session %s", len(stale_jobs), session_name)
+
         try:
-            # 1. Disconnect client
-            if session_name in self._active_clients:
-                client = self._active_clients.pop(session_name)
-                try:
-                    await client.disconnect()
-                except:
-                    pass
-            
-            # 2. Delete session file
-            session_path = self._get_session_path(session_name)
-            if session_path.exists():
-                try:
-                    session_path.unlink()
-                    logger.info(f"Deleted revoked session file: {session_path}")
-                except Exception as e:
-                    logger.error(f"Failed to delete revoked session file: {e}")
+            await self._logout_memory_and_file(session_name, self._get_session_path(session_name))
+        except Exception as e:
+            logger.error("Error handling revoked session %s: %s", session_name, e)
 
-            # 3. Fail active jobs associated with this session
-            try:
-                # Extract phone number guess
-                phone_part = session_name.split('_')[0]
-                if not phone_part.startswith('+') and phone_part.isdigit():
-                    phone_part = f"+{phone_part}"
-                
-                from app.database.connection import AsyncSessionLocal
-                from app.database.repositories.user_repository import UserRepository
-                from app.database.repositories.job_repository import JobRepository
-                
-                async with AsyncSessionLocal() as db:
-                    user_repo = UserRepository(db)
-                    job_repo = JobRepository(db)
-                    
-                    # Try to find user by likely phone number
-                    user = await user_repo.get_by_phone(phone_part)
-                    if user:
-                        active_jobs = await job_repo.get_active_jobs_by_user(user.id)
-                        for job in active_jobs:
-                            logger.warning(f"Failing job {job.job_id} due to revoked session {session_name}")
-                            await job_repo.update_status(
-                                job, 
-                                "failed", 
-                                error_message="Sessão revogada/inválida. Faça login novamente.",
-                                status_message=None
-                            )
-                        if active_jobs:
-                            await db.commit()
-                            logger.info(f"Failed {len(active_jobs)} jobs for revoked session {session_name}")
-            except Exception as e:
-                logger.error(f"Error failing jobs for revoked session {session_name}: {e}")
-                
+    async def _cleanup_revoked_sessions_in_db(self, session_names: list[str]) -> None:
+        """
+        Delete database sessions of revoked sessions and fail their active jobs.
+
+        Everything runs inside a single database session: one bulk DELETE for the
+        session rows and one IN (...) query each for users and their active jobs,
+        instead of separate connections and queries per revoked session.
+
+        Args:
+            session_names: Revoked session names
+        """
+        # Use the phone recorded at registration, guessing from the name only as a fallback
+        session_by_phone: dict[str, str] = {}
+        for session_name in session_names:
+            phone_number = self._session_to_phone.pop(session_name, None)
+            if phone_number is None:
+                match = _SESSION_NAME_RE.match(session_name)
+                phone_number = f"+{match.group(1)}" if match else session_name.partition("_")[0]
+            session_by_phone[phone_number] = session_name
+            self._expiry_cache.pop(phone_number, None)
+            self._mark_revoked(phone_number)
+
+        try:
+            async with AsyncSessionLocal() as db:
+                session_repo = self._get_session_repo(db)
+                user_repo = UserRepository(db)
+                job_repo = JobRepository(db)
+
+                deleted = await session_repo.delete_by_phones(list(session_by_phone))
+
+                # Try to find users by likely phone numbers
+                users = await user_repo.get_by_phones(list(session_by_phone))
+                session_by_user = {user.id: session_by_phone[phone] for phone, user in users.items()}
+
+                active_jobs = await job_repo.get_active_jobs_by_users(list(session_by_user))
+                for job in active_jobs:
+                    logger.warning("Failing job %s due to revoked session %s", job.job_id, session_by_user[job.user_id])
+                    await job_repo.update_status(
+                        job,
+                        "failed",
+                        error_message="Sessão revogada/inválida. Faça login novamente.",
+                        status_message=None
+                    )
+
+                await db.commit()
+                logger.info("Deleted %s revoked sessions from database and failed %s jobs", deleted, len(active_jobs))
         except Exception as e:
-            logger.error(f"Error handling revoked session {session_name}: {e}")
+            logger.error("Error cleaning up revoked sessions %s in database: %s", session_names, e)
+
+    def _mark_revoked(self, phone_number: str) -> None:
+        """Record that a phone's revocation was handled, dropping expired records."""
+        now = asyncio.get_running_loop().time()
+        if len(self._revoked_recently) >= _SESSION_CACHE_MAX_SIZE:
+            self._revoked_recently = {
+                phone: handled_at
+                for phone, handled_at in self._revoked_recently.items()
+                if now - handled_at < REVOCATION_DEDUP_SECONDS
+            }
+        self._revoked_recently[sanitize_phone(phone_number)] = now
+
+    def _was_revoked_recently(self, phone_number: str) -> bool:
+        """Return True if a revocation for this phone was handled within REVOCATION_DEDUP_SECONDS."""
+        handled_at = self._revoked_recently.get(sanitize_phone(phone_number))
+        return handled_at is not None and asyncio.get_running_loop().time() - handled_at < REVOCATION_DEDUP_SECONDS
 
     async def handle_session_revoked(self, phone_number: str) -> None:
         """
         Public method to handle a revoked session when detected from outside (e.g. CopyService).
+
+        Signals for a phone whose revocation was already handled (by the monitor or an
+        earlier call) within REVOCATION_DEDUP_SECONDS are ignored.
         
         Args:
            phone_number: Phone number
         """
+        if self._was_revoked_recently(phone_number):
+            logger.debug("Revocation for %s already handled, skipping", phone_number)
+            return
+
         logger.warning(f"Handling revoked session for {phone_number}")
+        self._mark_revoked(phone_number)
         async with AsyncSessionLocal() as db:
-             await self.logout(phone_number, db)
+            await self.logout(phone_number, db)
 
         logger.info("All Telegram clients cleaned up")
 
 
-    def add_real_time_handler(self, job_id: str, phone_number: str, handler: callable) -> None:
+    def add_real_time_handler(
+        self,
+        job_id: str,
+        phone_number: str,
+        handler: callable,
+        client: Optional[TelegramClient] = None
+    ) -> None:
         """
         Store real-time handler reference.
 
@@ -988,12 +1480,14 @@ class TelegramService:
             job_id: Job identifier
             phone_number: Phone number of the client
             handler: Event handler function
+            client: Client the handler was added to (optional, looked up by phone if omitted)
         """
         self._real_time_handlers[job_id] = {
             "handler": handler,
-            "phone_number": phone_number
+            "phone_number": phone_number,
+            "client": client
         }
-        logger.debug(f"Stored real-time handler for job {job_id}")
+        logger.debug("Stored real-time handler for job %s", job_id)
 
     async def remove_real_time_handler(self, job_id: str) -> None:
         """
@@ -1007,16 +1501,14 @@ class TelegramService:
             handler = data["handler"]
             phone_number = data["phone_number"]
 
-            # Try to find active client and remove handler
-            # We don't have API credentials here, so we try to find by phone number prefix
-            base_name = phone_number.replace("+", "").replace(" ", "").replace("-", "")
-            
-            # Find the correct client session
-            client = None
-            for session_name, active_client in self._active_clients.items():
-                if session_name.startswith(base_name):
-                    client = active_client
-                    break
+            # Prefer the client the handler was registered on
+            client = data.get("client")
+            if client is None:
+                # We don't have API credentials here, so we try to find by phone number prefix
+                for session_name in self._clients_by_phone.get(sanitize_phone(phone_number), ()):
+                    client = self._active_clients.get(session_name)
+                    if client:
+                        break
             
             if client:
                 try:
@@ -1028,5 +1520,5 @@ class TelegramService:
                 logger.warning(f"Active client not found for {phone_number} when removing handler for {job_id}")
 
             del self._real_time_handlers[job_id]
-            logger.debug(f"Removed real-time handler for job {job_id} from storage")
+            logger.debug("Removed real-time handler for job %s from storage", job_id)
 